@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+"""
+Compare the serial solvers with the component-aware parallel ones,
+to find the graph size (nodes + edges) where the process pool starts to pay off.
+
+    python benchmarks/components_speedup.py [processes]
+
+The parallel solvers run with min_parallel_work=0, i.e. always in the pool.
+The graphs are CA-GrQc and fragmented random graphs (many equal components).
+"""
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from linear_threshold import (  # noqa: E402
+    LinearThresholdModel,
+    parallel_diffuse,
+    parallel_find_mbs,
+    parallel_find_mds,
+    read_data,
+)
+
+# (components, nodes of a component, edges of a component)
+FRAGMENTED_GRAPHS = [
+    (10, 1_000, 3_000),
+    (20, 5_000, 15_000),
+    (40, 10_000, 30_000),
+    (40, 25_000, 75_000),
+]
+
+
+def fragmented_graph(components, nodes, edges, seed=0):
+    import networkx as nx
+
+    return nx.disjoint_union_all(
+        [nx.gnm_random_graph(nodes, edges, seed=seed + i) for i in range(components)]
+    )
+
+
+def timed(func, *args, **kwargs):
+    start = datetime.now()
+    result = func(*args, **kwargs)
+    return (datetime.now() - start).total_seconds(), result
+
+
+def compare(name, graph, processes):
+    work = graph.number_of_nodes() + graph.number_of_edges()
+    seeds = set(list(graph)[:: max(1, len(graph) // 50)])
+    lt_model = LinearThresholdModel(graph)
+    cases = [
+        ("mds", lt_model.find_mds_basing_max_degree, parallel_find_mds, ()),
+        ("mbs", lt_model.find_mbs, parallel_find_mbs, ()),
+        (
+            "diffuse",
+            lambda: lt_model.diffuse(seeds, 5),
+            parallel_diffuse,
+            (seeds, 5),
+        ),
+    ]
+    for case, serial, parallel, args in cases:
+        serial_cost, _ = timed(serial)
+        parallel_cost, _ = timed(
+            parallel, graph, *args, processes=processes, min_parallel_work=0
+        )
+        print(
+            f"{name} (work {work}) {case}: serial {serial_cost:.3f}s, "
+            f"parallel {parallel_cost:.3f}s, speedup {serial_cost / parallel_cost:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    import networkx as nx
+
+    processes_ = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    print(f"processes: {processes_ or os.cpu_count()}")
+
+    ca_grqc = nx.Graph()
+    ca_grqc.add_edges_from(read_data(ROOT / "data" / "CA-GrQc.txt"))
+    compare("CA-GrQc", ca_grqc, processes_)
+
+    for components_, nodes_, edges_ in FRAGMENTED_GRAPHS:
+        graph_ = fragmented_graph(components_, nodes_, edges_)
+        compare(f"{components_} x {nodes_} nodes", graph_, processes_)
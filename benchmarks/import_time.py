@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+import io
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+from pathlib import Path
+
+"""
+Measure the cold start of a batch worker (a new interpreter), on the current tree
+and on a baseline revision of linear_threshold, and list the heavy dependencies loaded.
+
+    python benchmarks/import_time.py [repeat] [baseline_rev]
+
+baseline_rev defaults to the root commit of the repository.
+
+Cases
+-----
+"import": only import LinearThresholdModel, the way a worker did before
+          (from linear_threshold.LT_model import LinearThresholdModel)
+"build":  import it, build a model on a small graph and diffuse once,
+          a worker which builds or unpickles a model pays for networkx here anyway,
+          so only the workers which never touch a networkx graph start faster
+"""
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ["networkx", "numpy", "scipy", "igraph", "plotly"]
+
+SNIPPETS = {
+    "import": "from linear_threshold.LT_model import LinearThresholdModel",
+    "build": (
+        "from linear_threshold.LT_model import LinearThresholdModel\n"
+        "import networkx as nx\n"
+        "LinearThresholdModel(nx.path_graph(100)).diffuse({0}, 3)"
+    ),
+}
+
+REPORT = (
+    "import sys, time, resource\n"
+    "start = time.perf_counter()\n"
+    "{snippet}\n"
+    "cost = time.perf_counter() - start\n"
+    "rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss\n"
+    "loaded = [m for m in {heavy!r} if m in sys.modules]\n"
+    "print(cost, rss, ','.join(loaded))\n"
+)
+
+
+def measure(snippet, cwd, repeat=5):
+    """
+        run the snippet in new interpreters
+    :param snippet:
+    :param cwd: the directory which contains the linear_threshold package
+    :param repeat:
+    :return: (median seconds, median max rss in KB, loaded heavy modules)
+    """
+    code = REPORT.format(snippet=snippet, heavy=HEAVY_MODULES)
+    costs, rss_list, loaded = [], [], ""
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        costs.append(float(output[0]))
+        rss_list.append(int(output[1]))
+        loaded = output[2] if len(output) > 2 else ""
+    return statistics.median(costs), statistics.median(rss_list), loaded
+
+
+def export_baseline(rev, target):
+    """
+        write linear_threshold of the revision into target
+    :return: target
+    """
+    archive = subprocess.run(
+        ["git", "archive", "--format=tar", rev, "linear_threshold"],
+        cwd=ROOT,
+        capture_output=True,
+        check=True,
+    ).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(target)
+    return target
+
+
+def root_commit():
+    return subprocess.run(
+        ["git", "rev-list", "--max-parents=0", "HEAD"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.split()[0]
+
+
+if __name__ == "__main__":
+    repeat_ = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    baseline_rev = sys.argv[2] if len(sys.argv) > 2 else root_commit()
+
+    with tempfile.TemporaryDirectory() as baseline_dir:
+        trees = {
+            f"baseline({baseline_rev[:7]})": export_baseline(
+                baseline_rev, baseline_dir
+            ),
+            "current": ROOT,
+        }
+        for case_, snippet_ in SNIPPETS.items():
+            for tree_, cwd_ in trees.items():
+                try:
+                    cost_, rss_, loaded_ = measure(snippet_, cwd_, repeat_)
+                except subprocess.CalledProcessError as e:
+                    print(f"{case_} {tree_}: failed\n{e.stderr}")
+                    continue
+                print(
+                    f"{case_} {tree_}: cost {cost_ * 1000:.1f}ms, "
+                    f"max rss {rss_ / 1024:.1f}MB, heavy modules: [{loaded_}]"
+                )
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+import random
+import sys
+from datetime import datetime
+from pathlib import Path
+
+"""
+Check SparseLinearThresholdModel against LinearThresholdModel.diffuse()
+on the bundled datasets, and compare their costs.
+
+    python benchmarks/sparse_diffusion.py [steps] [seed_sets]
+"""
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from linear_threshold import (  # noqa: E402
+    LinearThresholdModel,
+    SparseLinearThresholdModel,
+    read_data,
+)
+
+DATASETS = [
+    ("CA-GrQc.txt", False),
+    ("facebook_combined.txt", False),
+    ("Email-Enron.directed.txt", True),
+]
+
+
+def build_graph(file, directed):
+    import networkx as nx
+
+    graph = nx.DiGraph() if directed else nx.Graph()
+    graph.add_edges_from(read_data(ROOT / "data" / file))
+    return graph
+
+
+def same_layers(layers1, layers2):
+    # the order of the nodes in a layer doesn't matter
+    return [set(layer) for layer in layers1] == [set(layer) for layer in layers2]
+
+
+if __name__ == "__main__":
+    steps_ = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    seed_sets_num = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    rng = random.Random(0)
+
+    for file_, directed_ in DATASETS:
+        graph_ = build_graph(file_, directed_)
+        nodes = list(graph_)
+        seed_sets_ = [set(rng.sample(nodes, 10)) for _ in range(seed_sets_num)]
+
+        lt_model = LinearThresholdModel(graph_, cache_size=0)
+        start = datetime.now()
+        expected = [lt_model.diffuse(seeds, steps_) for seeds in seed_sets_]
+        reference_cost = datetime.now() - start
+
+        sparse_model = SparseLinearThresholdModel(graph_)
+        start = datetime.now()
+        one_by_one = [sparse_model.diffuse(seeds, steps_) for seeds in seed_sets_]
+        spmv_cost = datetime.now() - start
+
+        start = datetime.now()
+        batched = sparse_model.diffuse_many(seed_sets_, steps_)
+        spmm_cost = datetime.now() - start
+
+        matched = all(
+            same_layers(e, o) and same_layers(e, b)
+            for e, o, b in zip(expected, one_by_one, batched)
+        )
+        print(f"{file_}: {'OK' if matched else 'MISMATCH'}")
+        print(f"    reference cost: {reference_cost}s")
+        print(f"    sparse matrix-vector cost: {spmv_cost}s")
+        print(f"    sparse matrix-matrix cost: {spmm_cost}s")
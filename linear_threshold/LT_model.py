@@ -1,8 +1,7 @@
 #!/usr/bin/env python
 
 import copy
-
-import networkx as nx
+from collections import OrderedDict
 
 # -----------------------------------
 #  Diffusion Models
@@ -21,6 +20,9 @@ steps: int
     The number of steps to diffuse
     When steps <= 0, the model diffuses until no more nodes
     can be activated
+cache_size: int
+    The max number of the memoized results of diffuse() and link_the_fire()
+    When cache_size <= 0 (default), nothing is memoized
 Return
 ------
 layer_i_nodes : list of list of activated nodes
@@ -39,16 +41,27 @@ if the graph is a directed graph
 
 class LinearThresholdModel:
     def __init__(
-        self, graph, seeds: set = None, burning_seq: list = None, steps: int = 0
+        self,
+        graph,
+        seeds: set = None,
+        burning_seq: list = None,
+        steps: int = 0,
+        cache_size: int = 0,
     ):
         self.__graph = graph
         self.__seeds = seeds
         self.__burning_seq = burning_seq
         self.__steps = steps
+        # memoized results, (graph_version, kind, fingerprint...) -> result
+        self.__cache = OrderedDict()
+        self.__cache_size = cache_size
+        self.__cache_stats = {"hits": 0, "prefix_hits": 0, "misses": 0, "evictions": 0}
+        self.__graph_version = 0
+        self.__last_graph_version = None
         self.__init_model()
 
     def __init_model(self):
-        if type(self.__graph) == nx.MultiGraph or type(self.__graph) == nx.MultiDiGraph:
+        if self.__graph.is_multigraph():
             raise Exception(
                 "LinearThresholdModel is not defined for graphs with multi-edges."
             )
@@ -69,6 +82,18 @@ class LinearThresholdModel:
             seeds = self.__seeds
         if steps is None:
             steps = self.__steps
+        if self.__cache_size <= 0:
+            return self.__diffuse(seeds, steps)
+        # the seed set is unordered, so the frozenset is its canonical fingerprint
+        key = (self.__get_graph_version(), "diffuse", frozenset(seeds), max(steps, 0))
+        layer_i_nodes = self.__cache_get(key)
+        if layer_i_nodes is None:
+            layer_i_nodes = self.__diffuse(seeds, steps)
+            self.__cache_put(key, layer_i_nodes)
+        # copy the layers, so the caller can't change the memoized result
+        return [list(layer) for layer in layer_i_nodes]
+
+    def __diffuse(self, seeds, steps):
         if steps <= 0:
             # perform diffusion until no more nodes can be activated
             return self.__diffuse_all(seeds)
@@ -78,13 +103,57 @@ class LinearThresholdModel:
     def link_the_fire(self, burning_seq=None):
         if burning_seq is None:
             burning_seq = self.__burning_seq
+        burning_seq = list(burning_seq)
+        if self.__cache_size <= 0:
+            burned_set, burning_set = self.__link_the_fire(burning_seq, set(), set())
+            return len(burned_set | burning_set)
+
+        # fingerprints[k] is the fingerprint of burning_seq[:k]
+        fingerprints = [0]
+        for i in burning_seq:
+            fingerprints.append(hash((fingerprints[-1], i)))
+
+        # resume from the state of the longest memoized prefix
+        graph_version = self.__get_graph_version()
         burned_set = set()
         burning_set = set()
+        start = 0
+        for k in range(len(burning_seq), 0, -1):
+            state = self.__cache_get(
+                (graph_version, "fire", fingerprints[k], k), count_miss=False
+            )
+            if state is not None and state[0] == burning_seq[:k]:
+                burned_set, burning_set = set(state[1]), set(state[2])
+                start = k
+                break
+        if start == len(burning_seq) and start > 0:
+            self.__cache_stats["hits"] += 1
+        elif start > 0:
+            self.__cache_stats["prefix_hits"] += 1
+        else:
+            self.__cache_stats["misses"] += 1
+
+        if start < len(burning_seq):
+            burned_set, burning_set = self.__link_the_fire(
+                burning_seq[start:], burned_set, burning_set
+            )
+            self.__cache_put(
+                (graph_version, "fire", fingerprints[-1], len(burning_seq)),
+                (burning_seq, frozenset(burned_set), frozenset(burning_set)),
+            )
+        return len(burned_set | burning_set)
+
+    def __link_the_fire(self, burning_seq, burned_set, burning_set):
+        """
+            light the nodes of burning_seq one by one,
+            starting from burned_set and burning_set
+        :return: (burned_set, burning_set) after the last node is lit
+        """
         for i in burning_seq:
             if i not in burned_set:
                 burning_set.add(i)
                 burning_set = self.__fire(burning_set, burned_set)
-        return len(burned_set | burning_set)
+        return burned_set, burning_set
 
     def find_mds_basing_max_degree(self):
         """
@@ -158,6 +227,8 @@ class LinearThresholdModel:
         return minimal_burning_sequence_list
 
     def find_mds_basing_dfs(self, source=None):
+        import networkx as nx
+
         minimal_dominating_set = set()
 
         next_pre_dict = nx.dfs_predecessors(self.__graph, source)
@@ -307,6 +378,58 @@ class LinearThresholdModel:
                 if seed not in node_set:
                     raise Exception("seed ", seed, " is not in graph")
 
+    def __get_graph_version(self):
+        """
+            The graph is the caller's object (get_graph()) and can be changed in place,
+            so the version counts the nodes as well as mark_graph_changed().
+            Both are O(1), number_of_edges() would walk the whole graph on every call.
+        :return: (version, number_of_nodes)
+        """
+        graph_version = (self.__graph_version, self.__graph.number_of_nodes())
+        if graph_version != self.__last_graph_version:
+            # the memoized results of the other versions can never be used again
+            self.__last_graph_version = graph_version
+            self.clear_cache()
+        return graph_version
+
+    def __cache_get(self, key, count_miss=True):
+        result = self.__cache.get(key)
+        if result is not None:
+            self.__cache.move_to_end(key)
+            if count_miss:
+                self.__cache_stats["hits"] += 1
+        elif count_miss:
+            self.__cache_stats["misses"] += 1
+        return result
+
+    def __cache_put(self, key, result):
+        if self.__cache_size <= 0:
+            return
+        self.__cache[key] = result
+        self.__cache.move_to_end(key)
+        while len(self.__cache) > self.__cache_size:
+            self.__cache.popitem(last=False)
+            self.__cache_stats["evictions"] += 1
+
+    def clear_cache(self):
+        self.__cache.clear()
+
+    def mark_graph_changed(self):
+        """
+            Call it after the graph (get_graph()) is changed without changing
+            the number of nodes, e.g. an edge is added or removed,
+            or an edge's influence or a node's threshold is changed,
+            so the results memoized for the old graph are never used again.
+        :return:
+        """
+        self.__graph_version += 1
+        self.clear_cache()
+
+    def get_cache_stats(self):
+        return dict(
+            self.__cache_stats, size=len(self.__cache), max_size=self.__cache_size
+        )
+
     def set_seeds(self, seeds):
         self.__seeds = seeds
 
@@ -364,6 +487,8 @@ def init_influence4directed_graph(directed_graph):
 
 
 if __name__ == "__main__":
+    import networkx as nx
+
     dg = nx.DiGraph()
     dg.add_weighted_edges_from(
         [(1, 2, 0.5), (1, 3, 1.1), (4, 1, 2.3), (4, 2, 0.9)], weight="influence"
@@ -1 +1,49 @@
 #!/usr/bin/env python
+
+"""
+The public API is loaded lazily (PEP 562), a submodule is imported
+only when one of its names is accessed, e.g.
+
+    from linear_threshold import LinearThresholdModel
+
+doesn't import numpy, igraph or plotly, and networkx isn't imported
+until a function really needs it.
+"""
+
+import importlib
+
+# public name -> the submodule which defines it
+_LAZY_API = {
+    "LinearThresholdModel": "LT_model",
+    "init_threshold4directed_graph": "LT_model",
+    "init_influence4directed_graph": "LT_model",
+    "find_optimal": "find_optimal",
+    "read_data": "data_analysis",
+    "draw_3d": "data_analysis",
+    "label_components": "components",
+    "connected_components": "components",
+    "parallel_find_mds": "components",
+    "parallel_find_mbs": "components",
+    "parallel_diffuse": "components",
+    "SparseLinearThresholdModel": "sparse_model",
+    "seed_robustness": "robustness",
+    "burning_robustness": "robustness",
+    "ModelCache": "server",
+    "LTServer": "server",
+}
+
+__all__ = list(_LAZY_API)
+
+
+def __getattr__(name):
+    module_name = _LAZY_API.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    # cache it, so __getattr__ is called only once for each name
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
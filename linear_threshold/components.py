@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+from concurrent.futures import ProcessPoolExecutor
+
+from .LT_model import LinearThresholdModel
+
+# components smaller than this are packed together into one batch,
+# so that a worker is never started for a handful of nodes
+DEFAULT_MIN_COMPONENT_SIZE = 1000
+
+# graphs with less work than it (nodes + edges) are solved in the current process.
+# The solvers are nearly linear, so copying a subgraph out and rebuilding it in a worker
+# costs 10-20 times more than solving it (benchmarks/components_speedup.py), and the pool
+# only pays off with many workers on graphs larger than this
+DEFAULT_MIN_PARALLEL_WORK = 10_000_000
+
+
+def label_components(graph):
+    """
+        Label the (weakly) connected components of the graph by an array-based union-find.
+        The direction of the edges is ignored, so a directed graph is split into
+        its weakly connected components, which keeps every in-edge of a node
+        inside the node's component.
+    :param graph:
+    :return: (node_list, labels), labels[i] is the component label of node_list[i]
+    """
+    node_list = list(graph)
+    node_idx = {node: idx for idx, node in enumerate(node_list)}
+    parent = list(range(len(node_list)))
+    size = [1] * len(node_list)
+
+    def find(i):
+        # path halving
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for u, v in graph.edges():
+        root_u = find(node_idx[u])
+        root_v = find(node_idx[v])
+        if root_u == root_v:
+            continue
+        # union by size
+        if size[root_u] < size[root_v]:
+            root_u, root_v = root_v, root_u
+        parent[root_v] = root_u
+        size[root_u] += size[root_v]
+
+    labels = [find(i) for i in range(len(node_list))]
+    return node_list, labels
+
+
+def connected_components(graph):
+    """
+        Split the graph into its (weakly) connected components
+    :param graph:
+    :return: list of node lists, the largest component comes first
+    """
+    node_list, labels = label_components(graph)
+    component_dict = {}
+    for node, label in zip(node_list, labels):
+        component_dict.setdefault(label, []).append(node)
+    return sorted(component_dict.values(), key=len, reverse=True)
+
+
+def batch_components(components, min_component_size=DEFAULT_MIN_COMPONENT_SIZE):
+    """
+        Each large component becomes a batch of its own,
+        the tiny components are packed together until a batch reaches min_component_size.
+    :param components: list of node lists
+    :param min_component_size:
+    :return: list of node lists
+    """
+    batches = []
+    small_batch = []
+    for component in components:
+        if len(component) >= min_component_size:
+            batches.append(component)
+            continue
+        small_batch.extend(component)
+        if len(small_batch) >= min_component_size:
+            batches.append(small_batch)
+            small_batch = []
+    if small_batch:
+        batches.append(small_batch)
+    return batches
+
+
+def parallel_find_mds(
+    graph,
+    processes=None,
+    min_component_size=DEFAULT_MIN_COMPONENT_SIZE,
+    min_parallel_work=DEFAULT_MIN_PARALLEL_WORK,
+):
+    """
+        find the minimal dominating set component by component.
+        A node only dominates its neighbors, so the union of the components' results
+        is the same as LinearThresholdModel(graph).find_mds_basing_max_degree().
+    :param graph:
+    :param processes: the number of worker processes, None means os.cpu_count()
+    :param min_component_size:
+    :param min_parallel_work: a smaller graph is solved as a whole in the current process
+    :return: minimal_dominating_set
+    """
+    if _is_small(graph, processes, min_parallel_work):
+        return LinearThresholdModel(graph).find_mds_basing_max_degree()
+    batches = batch_components(connected_components(graph), min_component_size)
+    tasks = [(graph.subgraph(batch).copy(), "mds", None) for batch in batches]
+    minimal_dominating_set = set()
+    for result in _run_tasks(tasks, processes):
+        minimal_dominating_set |= result
+    return minimal_dominating_set
+
+
+def parallel_find_mbs(
+    graph,
+    processes=None,
+    min_component_size=DEFAULT_MIN_COMPONENT_SIZE,
+    min_parallel_work=DEFAULT_MIN_PARALLEL_WORK,
+):
+    """
+        find the minimal burning sequence component by component.
+        Every component is burned on its own, and the sequences are concatenated
+        in the order of their first nodes' degree (the order find_mbs picks nodes in).
+        Since the fire doesn't spread across components, the merged sequence
+        burns the whole graph, but it's usually a bit longer than
+        LinearThresholdModel(graph).find_mbs(), whose fire spreads in all components
+        at every step (e.g. 364 nodes against 359 on CA-GrQc).
+    :param graph:
+    :param processes: the number of worker processes, None means os.cpu_count()
+    :param min_component_size:
+    :param min_parallel_work: a smaller graph is solved as a whole in the current process,
+                              which gives the sequence of find_mbs()
+    :return: minimal_burning_sequence_list
+    """
+    if _is_small(graph, processes, min_parallel_work):
+        return LinearThresholdModel(graph).find_mbs()
+    batches = batch_components(connected_components(graph), min_component_size)
+    tasks = [(graph.subgraph(batch).copy(), "mbs", None) for batch in batches]
+    sequence_list = [seq for seq in _run_tasks(tasks, processes) if seq]
+    sequence_list.sort(key=lambda x: (graph.degree(x[0]), x[0]), reverse=True)
+    minimal_burning_sequence_list = []
+    for seq in sequence_list:
+        minimal_burning_sequence_list += seq
+    return minimal_burning_sequence_list
+
+
+def parallel_diffuse(
+    graph,
+    seeds,
+    steps=0,
+    processes=None,
+    min_component_size=DEFAULT_MIN_COMPONENT_SIZE,
+    min_parallel_work=DEFAULT_MIN_PARALLEL_WORK,
+):
+    """
+        diffuse the seeds component by component.
+        The components without seeds can't be activated, so they are skipped.
+        The kth layer of the result is the union of the components' kth layers,
+        a component which has finished keeps the layer diffuse() would give it:
+        all the neighbors of its active nodes (undirected graph), or nothing (directed graph).
+        Unlike diffuse(steps=0), which loops forever if some nodes can never be activated,
+        it stops after the round which activates nothing.
+    :param graph:
+    :param seeds:
+    :param steps: the same as LinearThresholdModel.diffuse()
+    :param processes: the number of worker processes, None means os.cpu_count()
+    :param min_component_size:
+    :param min_parallel_work: the components of a smaller graph are diffused
+                              in the current process
+    :return: layer_i_nodes
+    """
+    if _is_small(graph, processes, min_parallel_work):
+        processes = 1
+    seeds = set(seeds)
+    components = [c for c in connected_components(graph) if not seeds.isdisjoint(c)]
+    batches = batch_components(components, min_component_size)
+    tasks = [
+        (graph.subgraph(batch).copy(), "diffuse", (seeds.intersection(batch), steps))
+        for batch in batches
+    ]
+    if not tasks:
+        return [[]]
+
+    all_layers = _run_tasks(tasks, processes)
+    # the last round which activates new nodes in any batch
+    rounds = 0
+    active_num = 0
+    padding_list = []
+    for layers in all_layers:
+        active_set = set(layers[0])
+        for k, layer in enumerate(layers[1:], 1):
+            if not active_set.issuperset(layer):
+                active_set.update(layer)
+                rounds = max(rounds, k)
+        active_num += len(active_set)
+        if graph.is_directed():
+            padding_list.append([])
+        else:
+            padding_list.append(list({nbr for i in active_set for nbr in graph[i]}))
+    # like diffuse(), one more round which activates nothing, unless all nodes are active
+    if active_num < len(graph):
+        rounds += 1
+    if steps > 0:
+        rounds = min(rounds, steps)
+
+    layer_i_nodes = []
+    for k in range(rounds + 1):
+        merged_layer = []
+        for layers, padding in zip(all_layers, padding_list):
+            merged_layer += layers[k] if k < len(layers) else padding
+        layer_i_nodes.append(merged_layer)
+    return layer_i_nodes
+
+
+def _is_small(graph, processes, min_parallel_work):
+    if processes == 1:
+        return True
+    return graph.number_of_nodes() + graph.number_of_edges() < min_parallel_work
+
+
+def _run_tasks(tasks, processes=None):
+    """
+        run the tasks in worker processes,
+        a single task (or processes == 1) is run in the current process to save the pool's cost.
+    :param tasks: list of (subgraph, method, args)
+    :param processes:
+    :return: list of results, in the same order as tasks
+    """
+    if processes == 1 or len(tasks) <= 1:
+        return [_solve(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(_solve, tasks))
+
+
+def _solve(task):
+    subgraph, method, args = task
+    lt_model = LinearThresholdModel(subgraph)
+    if method == "mds":
+        return lt_model.find_mds_basing_max_degree()
+    if method == "mbs":
+        return lt_model.find_mbs()
+    if method == "diffuse":
+        seeds, steps = args
+        # diffuse(steps=0) loops forever if some nodes can never be activated,
+        # len(subgraph) rounds are always enough, and the diffusion stops
+        # after the round which activates nothing
+        return lt_model.diffuse(seeds, steps if steps > 0 else len(subgraph))
+    raise Exception(f"Task error: unknown method {method}.")
@@ -1,11 +1,6 @@
 #!/usr/bin/env python
 from datetime import datetime
 
-import igraph
-import networkx as nx
-import plotly.graph_objs as go
-from plotly.offline import iplot
-
 from linear_threshold.LT_model import LinearThresholdModel
 
 
@@ -20,34 +15,82 @@ def read_data(file):
     return dataset
 
 
-def draw_3d(edges_list):
+# the graphs larger than it are laid out by DrL instead of Kamada-Kawai
+KK_3D_MAX_NODES = 1000
+
+
+def draw_3d(
+    edges_list,
+    layout_name="auto",
+    max_edges=None,
+    layer_i_nodes=None,
+    filename=None,
+    seed=None,
+):
+    """
+        Draw the undirected graph in 3D
+    :param edges_list: [(u, v), ...]
+    :param layout_name: the 3D layout of igraph, e.g. "kk_3d", "drl_3d", "fr_3d".
+                        "auto": Kamada-Kawai (O(n^2) memory) for small graphs,
+                        the multilevel force-directed DrL for the large ones.
+    :param max_edges: draw at most max_edges edges (randomly sampled),
+                      the layout is still computed on all the edges
+    :param layer_i_nodes: the result of LinearThresholdModel.diffuse(),
+                          if given, the nodes are colored by the diffusion layer
+                          which activates them (-1: not activated)
+    :param filename: if given, write the figure to the offline HTML file,
+                     otherwise show it in the notebook
+    :param seed: the seed of the edge sampling
+    :return: the figure
+    """
+    # the plotting dependencies are heavy, so they are imported only when drawing
+    import igraph
+    import numpy as np
+    import plotly.graph_objs as go
+    from plotly.offline import iplot, plot
+
+    edges = np.asarray(edges_list).reshape(-1, 2)
+    # relabel the nodes to 0..n-1, so igraph doesn't create the missing ids
+    node_name, compact_edges = np.unique(edges, return_inverse=True)
+    compact_edges = compact_edges.reshape(-1, 2)
+    nodes_num = len(node_name)
+
     # get the Graph object from edges
-    ig = igraph.Graph(edges_list, directed=False)
-    udg = nx.Graph()
-    udg.add_edges_from(edges_list)
-    # Get the node positions, set by the Kamada-Kawai layout for 3D graphs
-    # layout is a list of three elements lists (the coordinates of nodes):
-    layout = ig.layout("kk_3d")
-    nodes_num = ig.vcount()
-    edges_num = ig.ecount()
-
-    node_name = [k for k in list(udg)]
-    node_color = [k for k in list(udg)]
-
-    x_node = [layout[k][0] for k in list(udg)]  # x-coordinates of nodes
-    y_node = [layout[k][1] for k in list(udg)]  # y-coordinates
-    z_node = [layout[k][2] for k in list(udg)]  # z-coordinates
-    x_edge = []
-    y_edge = []
-    z_edge = []
-    for edge in edges_list:
-        x_edge += [
-            layout[edge[0]][0],
-            layout[edge[1]][0],
-            None,
-        ]  # x-coordinates of edge ends
-        y_edge += [layout[edge[0]][1], layout[edge[1]][1], None]
-        z_edge += [layout[edge[0]][2], layout[edge[1]][2], None]
+    ig = igraph.Graph(n=nodes_num, edges=compact_edges.tolist(), directed=False)
+    if layout_name == "auto":
+        layout_name = "kk_3d" if nodes_num <= KK_3D_MAX_NODES else "drl_3d"
+    # coords[k] is the coordinates (x, y, z) of node_name[k]
+    coords = np.asarray(ig.layout(layout_name).coords, dtype=float)
+
+    if layer_i_nodes is None:
+        node_color = node_name
+    else:
+        node_color = np.full(nodes_num, -1)
+        for i, layer in enumerate(layer_i_nodes):
+            layer = np.asarray(layer, dtype=edges.dtype)
+            layer_idx = np.searchsorted(node_name, layer)
+            # skip the nodes which aren't in edges_list
+            found = layer_idx < nodes_num
+            found[found] = node_name[layer_idx[found]] == layer[found]
+            layer_idx = layer_idx[found]
+            # an undirected graph's layers repeat the active nodes,
+            # the first layer which activates a node wins
+            layer_idx = layer_idx[node_color[layer_idx] == -1]
+            node_color[layer_idx] = i
+
+    if max_edges is not None and len(compact_edges) > max_edges:
+        rng = np.random.default_rng(seed)
+        sampled = rng.choice(len(compact_edges), size=max_edges, replace=False)
+        compact_edges = compact_edges[sampled]
+
+    # every edge is drawn as (u, v, gap), the gap (NaN) breaks the line
+    edge_coords = np.full((len(compact_edges), 3, 3), np.nan)
+    edge_coords[:, 0] = coords[compact_edges[:, 0]]
+    edge_coords[:, 1] = coords[compact_edges[:, 1]]
+    edge_coords = edge_coords.reshape(-1, 3)
+
+    x_node, y_node, z_node = coords.T
+    x_edge, y_edge, z_edge = edge_coords.T
 
     trace1 = go.Scatter3d(
         x=x_edge,
@@ -101,11 +144,17 @@ def draw_3d(edges_list):
     data = [trace1, trace2]
     fig = go.Figure(data=data, layout=layout)
 
-    # py.iplot(fig, filename='Les-Miserables')
-    iplot(fig, filename="3D undirected graph")
+    if filename is not None:
+        plot(fig, filename=filename, auto_open=False)
+    else:
+        # py.iplot(fig, filename='Les-Miserables')
+        iplot(fig, filename="3D undirected graph")
+    return fig
 
 
 if __name__ == "__main__":
+    import networkx as nx
+
     mds_start = datetime.now()
     edges_data = read_data("../data/CA-GrQc.txt")
     mds_end = datetime.now()
@@ -1,8 +1,5 @@
 #!/usr/bin/env python
 
-import networkx
-from numpy import random
-
 from .LT_model import LinearThresholdModel
 
 
@@ -78,6 +75,8 @@ def quick_sort4tuple_list(unsorted_list, idx=0, is_ordered_by_ascend=True):
     :param is_ordered_by_ascend: default order by Ascend
     :return:
     """
+    from numpy import random
+
     data_len = len(unsorted_list)
     if data_len <= 1:
         return unsorted_list
@@ -100,6 +99,8 @@ def quick_sort4tuple_list(unsorted_list, idx=0, is_ordered_by_ascend=True):
 
 
 def quick_sort_by_recursion(arr):
+    from numpy import random
+
     data_len = len(arr)
     if data_len <= 1:
         return arr
@@ -188,6 +189,8 @@ def partition(arr, start_idx, end_idx):
 
 
 def random_partition4tuple_list(tuple_list, left, right, idx=0):
+    from numpy import random
+
     pivot_idx = random.randint(left, right + 1)
     tuple_list[pivot_idx], tuple_list[right] = tuple_list[right], tuple_list[pivot_idx]
     x = tuple_list[right][idx]
@@ -201,6 +204,8 @@ def random_partition4tuple_list(tuple_list, left, right, idx=0):
 
 
 def random_partition(arr, left, right):
+    from numpy import random
+
     pivot_idx = random.randint(left, right + 1)  # 生成[left,right]之间的一个随机数
     arr[pivot_idx], arr[right] = arr[right], arr[pivot_idx]
     x = arr[right]
@@ -219,6 +224,8 @@ def random_partition(arr, left, right):
 
 
 if __name__ == "__main__":
+    import networkx
+
     g = networkx.Graph()
     custom_ego_list = [
         (1, 5),
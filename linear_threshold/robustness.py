@@ -0,0 +1,372 @@
+#!/usr/bin/env python
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .LT_model import LinearThresholdModel
+
+"""
+Robustness and sensitivity analysis of seed sets (diffuse) and burning sequences (link_the_fire)
+
+Scenario
+--------
+Every edge fails independently with probability failure_prob, the surviving edges
+(the live-edge sample) of a scenario are drawn once and shared by the full seed set
+and all its leave-one-out variants, so their coverages are comparable.
+
+Shared work
+-----------
+1. diffuse: the activation distances of the full seed set are computed once per scenario,
+   removing a seed only repairs the nodes whose every shortest activation path
+   starts at it (decremental BFS), instead of diffusing again.
+2. link_the_fire: the fire state before every step is kept, removing the kth node of the
+   burning sequence resumes from the state before the kth step.
+3. The scenarios are independent, so they are analyzed in parallel by worker processes.
+
+Notes
+-----
+The activation follows LinearThresholdModel.diffuse(): a node reached by an active
+neighbor (predecessor) is activated, for a directed graph only if the influence sum
+of its surviving in-edges >= its threshold.
+"""
+
+
+def seed_robustness(
+    graph,
+    seeds,
+    failure_prob=0.1,
+    samples=100,
+    steps=0,
+    processes=None,
+    random_seed=None,
+):
+    """
+        The coverage of diffuse(seeds, steps) under edge failures,
+        and the contribution of every seed by leave-one-out
+    :param graph:
+    :param seeds:
+    :param failure_prob: the probability of an edge failure
+    :param samples: the number of the edge-failure scenarios
+    :param steps: When steps <= 0, diffuse until no more nodes can be activated
+    :param processes: the number of worker processes, None means os.cpu_count()
+    :param random_seed: the seed of the scenarios, the result doesn't depend on processes
+    :return: the report, see _summarize()
+    """
+    structure = _build_structure(graph)
+    seed_idx = [structure["node_idx"][seed] for seed in set(seeds)]
+    results = _run_scenarios(
+        structure,
+        ("diffuse", seed_idx, steps),
+        failure_prob,
+        samples,
+        processes,
+        random_seed,
+    )
+    return _summarize(results, [structure["node_list"][i] for i in seed_idx])
+
+
+def burning_robustness(
+    graph,
+    burning_seq,
+    failure_prob=0.1,
+    samples=100,
+    processes=None,
+    random_seed=None,
+):
+    """
+        The coverage of link_the_fire(burning_seq) under edge failures,
+        and the contribution of every node of the burning sequence by leave-one-out
+    :param graph:
+    :param burning_seq:
+    :param failure_prob: the probability of an edge failure
+    :param samples: the number of the edge-failure scenarios
+    :param processes: the number of worker processes, None means os.cpu_count()
+    :param random_seed: the seed of the scenarios, the result doesn't depend on processes
+    :return: the report, see _summarize()
+    """
+    structure = _build_structure(graph)
+    seq_idx = [structure["node_idx"][node] for node in burning_seq]
+    results = _run_scenarios(
+        structure,
+        ("fire", seq_idx, None),
+        failure_prob,
+        samples,
+        processes,
+        random_seed,
+    )
+    return _summarize(results, list(burning_seq))
+
+
+def _summarize(results, removed_list):
+    """
+    :param results: list of (coverage, [coverage without removed_list[k], ...]), one for each scenario
+    :param removed_list: the seeds (or the nodes of the burning sequence) in order,
+                         a burning sequence may repeat a node, so the report is by position
+    :return: {
+        "coverage": the coverages of the scenarios,
+        "mean_coverage", "std_coverage", "min_coverage",
+        "nodes": removed_list,
+        "leave_one_out": [the coverages of the scenarios without nodes[k], ...],
+        "contribution": [the mean coverage loss without nodes[k], ...],
+    }
+    """
+    coverage = np.array([c for c, _ in results], dtype=float)
+    loo = np.array([loo for _, loo in results], dtype=float).reshape(
+        len(results), len(removed_list)
+    )
+    return {
+        "coverage": coverage.astype(int).tolist(),
+        "mean_coverage": float(coverage.mean()) if len(coverage) else 0.0,
+        "std_coverage": float(coverage.std()) if len(coverage) else 0.0,
+        "min_coverage": int(coverage.min()) if len(coverage) else 0,
+        "nodes": list(removed_list),
+        "leave_one_out": [
+            loo[:, k].astype(int).tolist() for k in range(len(removed_list))
+        ],
+        "contribution": [
+            float((coverage - loo[:, k]).mean()) if len(coverage) else 0.0
+            for k in range(len(removed_list))
+        ],
+    }
+
+
+def _build_structure(graph):
+    """
+        The graph in CSR arrays, so a scenario is only a boolean mask of the edges.
+        An undirected edge appears in both directions with the same edge id.
+    :param graph:
+    :return: dict
+    """
+    # init the thresholds and influences in the same way as the reference model
+    graph = LinearThresholdModel(graph, cache_size=0).get_graph()
+    directed = graph.is_directed()
+    node_list = list(graph)
+    node_idx = {node: idx for idx, node in enumerate(node_list)}
+    n = len(node_list)
+
+    edge_list = list(graph.edges(data="influence"))
+    m = len(edge_list)
+    src = np.fromiter((node_idx[u] for u, _, _ in edge_list), dtype=np.int64, count=m)
+    dst = np.fromiter((node_idx[v] for _, v, _ in edge_list), dtype=np.int64, count=m)
+    eid = np.arange(m)
+    if not directed:
+        src, dst, eid = np.r_[src, dst], np.r_[dst, src], np.r_[eid, eid]
+
+    structure = {
+        "directed": directed,
+        "node_list": node_list,
+        "node_idx": node_idx,
+        "n": n,
+        "m": m,
+        "out": _to_csr(src, dst, eid, n),
+        "in": _to_csr(dst, src, eid, n),
+    }
+    if directed:
+        structure["edge_dst"] = dst
+        structure["influence"] = np.array(
+            [influence for _, _, influence in edge_list], dtype=float
+        )
+        structure["threshold"] = np.array(
+            [graph.nodes[node]["threshold"] for node in node_list], dtype=float
+        )
+    return structure
+
+
+def _to_csr(src, dst, eid, n):
+    order = np.argsort(src, kind="stable")
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return indptr, dst[order], eid[order]
+
+
+def _run_scenarios(structure, task, failure_prob, samples, processes, random_seed):
+    if random_seed is None:
+        random_seed = int(np.random.SeedSequence().entropy % (2**32))
+    scenario_list = list(range(samples))
+    # the workers don't need the node labels
+    structure = {
+        k: v for k, v in structure.items() if k not in ("node_list", "node_idx")
+    }
+    if processes == 1 or samples <= 1:
+        return _analyze_chunk(
+            (structure, task, failure_prob, random_seed, scenario_list)
+        )
+
+    # a few chunks per worker, so every worker unpickles the structure only a few times
+    chunk_num = min(samples, (processes or os.cpu_count() or 1) * 4)
+    chunks = [
+        (structure, task, failure_prob, random_seed, scenario_list[k::chunk_num])
+        for k in range(chunk_num)
+    ]
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        chunk_results = list(executor.map(_analyze_chunk, chunks))
+
+    results = [None] * samples
+    for k, chunk_result in enumerate(chunk_results):
+        results[k::chunk_num] = chunk_result
+    return results
+
+
+def _analyze_chunk(chunk):
+    structure, task, failure_prob, random_seed, scenario_list = chunk
+    kind, sources, steps = task
+    graph_lists = {
+        "out": [a.tolist() for a in structure["out"]],
+        "in": [a.tolist() for a in structure["in"]],
+    }
+    results = []
+    for scenario in scenario_list:
+        # the live-edge sample of the scenario, shared by all the leave-one-out variants
+        rng = np.random.default_rng((random_seed, scenario))
+        live_mask = rng.random(structure["m"]) >= failure_prob
+        if structure["directed"]:
+            # a node can be activated if the influence sum of its live in-edges >= threshold
+            in_influence = np.bincount(
+                structure["edge_dst"][live_mask],
+                weights=structure["influence"][live_mask],
+                minlength=structure["n"],
+            )
+            can = (in_influence >= structure["threshold"]).tolist()
+        else:
+            can = [True] * structure["n"]
+        live = live_mask.tolist()
+
+        if kind == "diffuse":
+            result = _diffuse_leave_one_out(graph_lists, live, can, sources, steps)
+        else:
+            result = _fire_leave_one_out(graph_lists["out"], live, sources)
+        results.append(result)
+    return results
+
+
+def _diffuse_leave_one_out(graph_lists, live, can, seeds, steps):
+    """
+    :return: (coverage, [coverage without seeds[k], ...])
+    """
+    out_indptr, out_indices, out_eid = graph_lists["out"]
+    in_indptr, in_indices, in_eid = graph_lists["in"]
+    n = len(out_indptr) - 1
+    seed_set = set(seeds)
+
+    # >>>>>>>>>> the activation distances of the full seed set <<<<<<<<<<
+    dist = [-1] * n
+    for s in seeds:
+        dist[s] = 0
+    frontier = list(seeds)
+    active_list = list(seeds)
+    d = 0
+    while frontier and (steps <= 0 or d < steps):
+        d += 1
+        next_frontier = []
+        for u in frontier:
+            for k in range(out_indptr[u], out_indptr[u + 1]):
+                v = out_indices[k]
+                if dist[v] < 0 and can[v] and live[out_eid[k]]:
+                    dist[v] = d
+                    next_frontier.append(v)
+        active_list += next_frontier
+        frontier = next_frontier
+    coverage = len(active_list)
+
+    # support[v]: the number of v's live in-edges from the nodes whose distance is dist[v] - 1
+    support = [0] * n
+    for u in active_list:
+        for k in range(out_indptr[u], out_indptr[u + 1]):
+            v = out_indices[k]
+            if dist[v] == dist[u] + 1 and live[out_eid[k]]:
+                support[v] += 1
+
+    # >>>>>>>>>> leave one out, repair the nodes which lose their support <<<<<<<<<<
+    loo_coverage = []
+    for removed in seeds:
+        # the nodes whose distance increases, the removed seed comes first
+        affected = [removed]
+        affected_set = {removed}
+        left_support = {}
+        for x in affected:
+            for k in range(out_indptr[x], out_indptr[x + 1]):
+                v = out_indices[k]
+                if (
+                    dist[v] == dist[x] + 1
+                    and v not in seed_set
+                    and v not in affected_set
+                    and live[out_eid[k]]
+                ):
+                    left_support[v] = left_support.get(v, support[v]) - 1
+                    if left_support[v] == 0:
+                        affected.append(v)
+                        affected_set.add(v)
+
+        # the new distances of the affected nodes, from their unaffected in-neighbors
+        new_dist = {}
+        heap = []
+        for v in affected:
+            if not can[v]:
+                continue
+            best = -1
+            for k in range(in_indptr[v], in_indptr[v + 1]):
+                u = in_indices[k]
+                if dist[u] >= 0 and u not in affected_set and live[in_eid[k]]:
+                    if best < 0 or dist[u] + 1 < best:
+                        best = dist[u] + 1
+            if best > 0 and (steps <= 0 or best <= steps):
+                new_dist[v] = best
+                heapq.heappush(heap, (best, v))
+        while heap:
+            d, x = heapq.heappop(heap)
+            if new_dist[x] < d:
+                continue
+            if steps > 0 and d >= steps:
+                continue
+            for k in range(out_indptr[x], out_indptr[x + 1]):
+                v = out_indices[k]
+                if v in affected_set and can[v] and live[out_eid[k]]:
+                    if v not in new_dist or d + 1 < new_dist[v]:
+                        new_dist[v] = d + 1
+                        heapq.heappush(heap, (d + 1, v))
+        loo_coverage.append(coverage - len(affected) + len(new_dist))
+    return coverage, loo_coverage
+
+
+def _fire_leave_one_out(out_lists, live, burning_seq):
+    """
+    :return: (coverage, [coverage without burning_seq[k], ...])
+    """
+    states = []
+    coverage = _fire(out_lists, live, burning_seq, set(), set(), states)
+    loo_coverage = []
+    for k in range(len(burning_seq)):
+        # the steps before k are the same, so resume from the state before the kth step
+        burned_set, burning_set = states[k]
+        loo_coverage.append(
+            _fire(out_lists, live, burning_seq[k + 1 :], burned_set, burning_set)
+        )
+    return coverage, loo_coverage
+
+
+def _fire(out_lists, live, burning_seq, burned_set, burning_set, states=None):
+    """
+        the same as LinearThresholdModel.link_the_fire(), but only on the live edges
+    :param states: if given, the state (burned_set, burning_set) before every step is appended
+    :return: the number of the burned nodes
+    """
+    out_indptr, out_indices, out_eid = out_lists
+    burned_set = set(burned_set)
+    burning_set = set(burning_set)
+    for i in burning_seq:
+        if states is not None:
+            states.append((set(burned_set), set(burning_set)))
+        if i in burned_set:
+            continue
+        burning_set.add(i)
+        burned_set |= burning_set
+        next_burning_set = set()
+        for u in burning_set:
+            for k in range(out_indptr[u], out_indptr[u + 1]):
+                v = out_indices[k]
+                if v not in burned_set and live[out_eid[k]]:
+                    next_burning_set.add(v)
+        burning_set = next_burning_set
+    return len(burned_set | burning_set)
@@ -0,0 +1,406 @@
+#!/usr/bin/env python
+import argparse
+import asyncio
+import json
+import multiprocessing
+import pickle
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from .LT_model import LinearThresholdModel
+
+"""
+A tiny HTTP/JSON front-end of LinearThresholdModel (standard library only).
+
+Routes
+------
+GET    /models                  the cached models and the cache stats
+PUT    /models/<name>           build a model, body: {"edges": [[u, v], ...], "directed": false}
+DELETE /models/<name>           drop a model
+POST   /models/<name>/diffuse   body: {"seeds": [...], "steps": 0}
+                                steps <= 0: until a round activates nothing
+POST   /models/<name>/spread    body: {"burning_seq": [...]}
+POST   /models/<name>/mds       find_mds_basing_max_degree()
+POST   /models/<name>/mbs       find_mbs()
+
+Notes
+-----
+1. The models are kept warm (built and initialized) in pickled form,
+   so the size of a cache entry is known exactly and the eviction is based on memory.
+   max_bytes only bounds these pickled models in the server process,
+   besides them every worker keeps up to WORKER_MODELS_SIZE unpickled models.
+2. All the CPU-bound work runs in a process pool, the event loop only parses requests.
+   A query is sent to a worker without the pickled model, the model is sent
+   only if that worker doesn't keep it yet.
+3. The identical queries in flight are coalesced, they share one result.
+"""
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+HTTP_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class UnknownNodeError(Exception):
+    pass
+
+
+class ModelCache:
+    """
+    LRU cache of pickled models, the least recently used models are evicted
+    when the total size is larger than max_bytes (the latest model is always kept).
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # name -> (version, blob)
+        self.__entries = OrderedDict()
+        self.__version = 0
+
+    def get(self, name):
+        entry = self.__entries.get(name)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.__entries.move_to_end(name)
+        return entry
+
+    def put(self, name, blob):
+        self.pop(name)
+        self.__version += 1
+        self.__entries[name] = (self.__version, blob)
+        self.total_bytes += len(blob)
+        while self.total_bytes > self.max_bytes and len(self.__entries) > 1:
+            _, (_, evicted_blob) = self.__entries.popitem(last=False)
+            self.total_bytes -= len(evicted_blob)
+            self.evictions += 1
+        return self.__version
+
+    def pop(self, name):
+        entry = self.__entries.pop(name, None)
+        if entry is not None:
+            self.total_bytes -= len(entry[1])
+        return entry
+
+    def stats(self):
+        return {
+            "models": {name: len(blob) for name, (_, blob) in self.__entries.items()},
+            "total_bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class LTServer:
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=8080,
+        max_bytes=DEFAULT_MAX_BYTES,
+        processes=None,
+    ):
+        self.host = host
+        self.port = port
+        self.cache = ModelCache(max_bytes)
+        self.__processes = processes
+        self.__executor = None
+        self.__server = None
+        # (name, version, op, args) -> future of the query in flight
+        self.__in_flight = {}
+        self.coalesced = 0
+
+    async def start(self):
+        # the workers mustn't be forked from the server, or they would inherit
+        # the sockets open at that moment, and those clients would never get EOF
+        start_method = (
+            "forkserver"
+            if "forkserver" in multiprocessing.get_all_start_methods()
+            else "spawn"
+        )
+        self.__executor = ProcessPoolExecutor(
+            max_workers=self.__processes,
+            mp_context=multiprocessing.get_context(start_method),
+        )
+        self.__server = await asyncio.start_server(
+            self.__handle_connection, self.host, self.port
+        )
+        # port 0 means a free port is picked by the system
+        self.port = self.__server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        if self.__server is None:
+            await self.start()
+        async with self.__server:
+            await self.__server.serve_forever()
+
+    async def close(self):
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+        if self.__executor is not None:
+            self.__executor.shutdown()
+
+    async def __handle_connection(self, reader, writer):
+        try:
+            try:
+                method, path, body = await read_request(reader)
+                status, payload = 200, await self.__dispatch(method, path, body)
+            except HTTPError as e:
+                status, payload = e.status, {"error": e.message}
+            except Exception as e:
+                status, payload = 500, {"error": str(e)}
+            writer.write(build_response(status, payload))
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def __dispatch(self, method, path, body):
+        parts = [p for p in path.split("/") if p]
+        if not parts or parts[0] != "models":
+            raise HTTPError(404, f"Unknown path {path}.")
+
+        if len(parts) == 1:
+            if method != "GET":
+                raise HTTPError(405, f"{method} is not allowed on {path}.")
+            return dict(self.cache.stats(), coalesced=self.coalesced)
+
+        name = parts[1]
+        if len(parts) == 2:
+            if method == "PUT":
+                return await self.__load(name, body)
+            if method == "DELETE":
+                if self.cache.pop(name) is None:
+                    raise HTTPError(404, f"Model {name} is not loaded.")
+                return {"name": name}
+            raise HTTPError(405, f"{method} is not allowed on {path}.")
+
+        if len(parts) != 3:
+            raise HTTPError(404, f"Unknown path {path}.")
+        if method != "POST":
+            raise HTTPError(405, f"{method} is not allowed on {path}.")
+        return await self.__query(name, parts[2], body)
+
+    async def __load(self, name, body):
+        edges = body.get("edges")
+        if not isinstance(edges, list) or not all(
+            isinstance(edge, list)
+            and len(edge) in (2, 3)
+            and all(is_node(node) for node in edge[:2])
+            for edge in edges
+        ):
+            raise HTTPError(
+                400, '"edges" must be a list of [u, v] or [u, v, influence].'
+            )
+        directed = bool(body.get("directed", False))
+        loop = asyncio.get_running_loop()
+        blob = await loop.run_in_executor(
+            self.__executor, build_model_blob, edges, directed
+        )
+        version = self.cache.put(name, blob)
+        return {"name": name, "version": version, "bytes": len(blob)}
+
+    async def __query(self, name, op, body):
+        if op == "diffuse":
+            seeds = get_node_list(body, "seeds")
+            steps = body.get("steps", 0)
+            if not isinstance(steps, int) or isinstance(steps, bool):
+                raise HTTPError(400, '"steps" must be an integer.')
+            # the seeds are a set, so the order of them doesn't matter
+            args = (tuple(sorted(set(seeds), key=repr)), steps)
+        elif op == "spread":
+            args = (tuple(get_node_list(body, "burning_seq")),)
+        elif op in ("mds", "mbs"):
+            args = ()
+        else:
+            raise HTTPError(404, f"Unknown query {op}.")
+
+        entry = self.cache.get(name)
+        if entry is None:
+            raise HTTPError(404, f"Model {name} is not loaded.")
+        version, blob = entry
+
+        key = (name, version, op, args)
+        future = self.__in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            future = asyncio.ensure_future(self.__run_query(version, blob, op, args))
+            self.__in_flight[key] = future
+            future.add_done_callback(lambda _: self.__in_flight.pop(key, None))
+        try:
+            return {"result": await asyncio.shield(future)}
+        except UnknownNodeError as e:
+            raise HTTPError(404, f"{e} (model {name}).")
+
+    async def __run_query(self, version, blob, op, args):
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            self.__executor, run_query, version, None, op, args
+        )
+        if result == MODEL_MISSING:
+            # that worker doesn't keep the model, send it this time
+            result = await loop.run_in_executor(
+                self.__executor, run_query, version, blob, op, args
+            )
+        return result
+
+
+def is_node(value):
+    # the nodes are the JSON scalars, which are hashable
+    return isinstance(value, (int, float, str)) and not isinstance(value, bool)
+
+
+def get_node_list(body, field):
+    nodes = body.get(field)
+    if not isinstance(nodes, list) or not all(is_node(node) for node in nodes):
+        raise HTTPError(400, f'"{field}" must be a list of nodes (numbers or strings).')
+    return nodes
+
+
+async def read_request(reader):
+    """
+        read an HTTP/1.x request whose body is JSON
+    :param reader:
+    :return: (method, path, body)
+    """
+    request_line = await reader.readline()
+    try:
+        method, path, _ = request_line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "Malformed request line.")
+
+    content_length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        if key.strip().lower() == "content-length":
+            try:
+                content_length = int(value.strip())
+            except ValueError:
+                raise HTTPError(400, "Content-Length must be an integer.")
+
+    body = {}
+    if content_length > 0:
+        try:
+            raw = await reader.readexactly(content_length)
+        except asyncio.IncompleteReadError:
+            raise HTTPError(400, "The body is shorter than Content-Length.")
+        try:
+            body = json.loads(raw)
+        except ValueError:
+            raise HTTPError(400, "The body is not valid JSON.")
+        if not isinstance(body, dict):
+            raise HTTPError(400, "The body must be a JSON object.")
+    return method.upper(), path.split("?")[0], body
+
+
+def build_response(status, payload):
+    data = json.dumps(payload).encode()
+    head = (
+        f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(data)}\r\n"
+        "Connection: close\r\n\r\n"
+    )
+    return head.encode("latin-1") + data
+
+
+# -----------------------------------
+#  Worker side (run in the process pool)
+# -----------------------------------
+
+# the latest models unpickled by this worker, version -> model
+_worker_models = OrderedDict()
+WORKER_MODELS_SIZE = 4
+
+# run_query() returns it when the worker doesn't keep the model and no blob is given
+MODEL_MISSING = "__model_missing__"
+
+
+def build_model_blob(edges, directed=False):
+    import networkx as nx
+
+    graph = nx.DiGraph() if directed else nx.Graph()
+    for edge in edges:
+        if len(edge) > 2:
+            graph.add_edge(edge[0], edge[1], influence=edge[2])
+        else:
+            graph.add_edge(edge[0], edge[1])
+    return pickle.dumps(LinearThresholdModel(graph), pickle.HIGHEST_PROTOCOL)
+
+
+def run_query(version, blob, op, args):
+    lt_model = _load_model(version, blob)
+    if lt_model is None:
+        return MODEL_MISSING
+    if op in ("diffuse", "spread"):
+        graph = lt_model.get_graph()
+        for node in args[0]:
+            if node not in graph:
+                raise UnknownNodeError(f"Node {node!r} is not in the graph")
+    if op == "diffuse":
+        seeds, steps = args
+        # diffuse(steps=0) loops forever if some nodes can never be activated,
+        # which would block the worker for good. len(graph) rounds are always enough,
+        # and the diffusion stops after the round which activates nothing
+        if steps <= 0:
+            steps = len(lt_model.get_graph())
+        return lt_model.diffuse(set(seeds), steps)
+    if op == "spread":
+        return lt_model.link_the_fire(list(args[0]))
+    if op == "mds":
+        return sorted(lt_model.find_mds_basing_max_degree(), key=repr)
+    if op == "mbs":
+        return lt_model.find_mbs()
+    raise Exception(f"Query error: unknown query {op}.")
+
+
+def _load_model(version, blob):
+    # a version is never reused for another blob,
+    # so a worker can keep the unpickled models of the hot versions
+    lt_model = _worker_models.get(version)
+    if lt_model is None:
+        if blob is None:
+            return None
+        lt_model = pickle.loads(blob)
+        _worker_models[version] = lt_model
+        if len(_worker_models) > WORKER_MODELS_SIZE:
+            _worker_models.popitem(last=False)
+    else:
+        _worker_models.move_to_end(version)
+    return lt_model
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LT model service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-bytes", type=int, default=DEFAULT_MAX_BYTES)
+    parser.add_argument("--processes", type=int, default=None)
+    cli_args = parser.parse_args()
+
+    lt_server = LTServer(
+        cli_args.host, cli_args.port, cli_args.max_bytes, cli_args.processes
+    )
+    asyncio.run(lt_server.serve_forever())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+import numpy as np
+import scipy.sparse as sp
+
+from .LT_model import LinearThresholdModel
+
+"""
+The sparse linear-algebra formulation of LinearThresholdModel.diffuse()
+
+Every round of the diffusion is one sparse product:
+    reached_in = A^T · frontier          (A: the adjacency matrix in CSR)
+    influence_in += W^T · frontier       (W: the "influence" matrix in CSR)
+and a vectorized threshold comparison.
+A frontier of many seed sets is a (n x s) matrix, so they diffuse together
+by one sparse matrix-matrix product per round.
+
+Rules (directed graph)
+----------------------
+"reference": the same as LinearThresholdModel.diffuse(), a node reached by an active
+             predecessor is activated if the influence sum of all its in-edges >= threshold
+"influence": the classic LT rule, a node is activated if the influence sum of
+             its active predecessors >= threshold
+An undirected graph always follows LinearThresholdModel.diffuse(),
+i.e. all the neighbors of the active nodes are activated.
+
+Notes
+-----
+LinearThresholdModel.diffuse(steps=0) loops forever if some nodes can never be activated,
+here the diffusion stops (after an empty layer, like steps > 0) when no more nodes
+can be activated.
+"""
+
+
+class SparseLinearThresholdModel:
+    def __init__(self, graph, rule="reference"):
+        if rule not in ("reference", "influence"):
+            raise Exception(f"Rule error: unknown rule {rule}.")
+        # init the thresholds and influences in the same way as the reference model
+        graph = LinearThresholdModel(graph, cache_size=0).get_graph()
+        self.__rule = rule
+        self.__directed = graph.is_directed()
+        self.__node_list = list(graph)
+        self.__node_idx = {node: idx for idx, node in enumerate(self.__node_list)}
+        self.__node_array = np.empty(len(self.__node_list), dtype=object)
+        self.__node_array[:] = self.__node_list
+        self.__init_matrices(graph)
+
+    def __init_matrices(self, graph):
+        import networkx as nx
+
+        n = len(self.__node_list)
+        if not self.__directed:
+            # adjacency[u][v] = 1, it's symmetric
+            self.__adjacency_t = nx.to_scipy_sparse_array(
+                graph, self.__node_list, weight=None, format="csr"
+            )
+            return
+
+        # influence[u][v] = the influence of edge(u, v)
+        influence = nx.to_scipy_sparse_array(
+            graph, self.__node_list, weight="influence", format="csr"
+        )
+        adjacency = influence.copy()
+        adjacency.data[:] = 1
+        self.__influence_t = influence.T.tocsr()
+        self.__adjacency_t = adjacency.T.tocsr()
+        self.__thresholds = np.array(
+            [graph.nodes[node]["threshold"] for node in self.__node_list], dtype=float
+        )
+        # the influence sum of all in-edges, i.e. W^T · 1
+        in_influence = self.__influence_t @ np.ones(n)
+        self.__can_be_activated = in_influence >= self.__thresholds
+
+    def diffuse(self, seeds, steps=0):
+        """
+            the same as LinearThresholdModel.diffuse()
+        :param seeds:
+        :param steps: When steps <= 0, diffuse until no more nodes can be activated
+        :return: layer_i_nodes
+        """
+        return self.diffuse_many([seeds], steps)[0]
+
+    def diffuse_many(self, seed_sets, steps=0):
+        """
+            diffuse many seed sets at once, one sparse matrix-matrix product per round
+        :param seed_sets: list of seed sets
+        :param steps: When steps <= 0, diffuse until no more nodes can be activated
+        :return: list of layer_i_nodes, one for each seed set
+        """
+        n = len(self.__node_list)
+        s = len(seed_sets)
+        active = np.zeros((n, s), dtype=bool)
+        result = []
+        for j, seeds in enumerate(seed_sets):
+            seeds = set(seeds)
+            active[[self.__node_idx[seed] for seed in seeds], j] = True
+            result.append([[i for i in seeds]])
+        frontier = active.copy()
+        influence_in = np.zeros((n, s)) if self.__rule == "influence" else None
+
+        # the seed sets whose diffusion isn't finished
+        running = np.ones(s, dtype=bool)
+        rounds = 0
+        while steps <= 0 or rounds < steps:
+            running &= active.sum(axis=0) < n
+            cols = np.flatnonzero(running)
+            if len(cols) == 0:
+                break
+
+            if not self.__directed:
+                # all the neighbors of the active nodes, the active ones included
+                layers = self.__spread(self.__adjacency_t, active[:, cols]) > 0
+                new = layers & ~active[:, cols]
+            elif self.__rule == "reference":
+                reached = self.__spread(self.__adjacency_t, frontier[:, cols]) > 0
+                new = reached & ~active[:, cols] & self.__can_be_activated[:, None]
+                layers = new
+            else:
+                influence_in[:, cols] += self.__spread(
+                    self.__influence_t, frontier[:, cols]
+                )
+                over_threshold = influence_in[:, cols] >= self.__thresholds[:, None]
+                new = over_threshold & ~active[:, cols]
+                layers = new
+
+            for k, j in enumerate(cols):
+                result[j].append(self.__node_array[layers[:, k]].tolist())
+            active[:, cols] |= new
+            frontier[:] = False
+            frontier[:, cols] = new
+            # a seed set stops after the round which activates nothing
+            running[cols[~new.any(axis=0)]] = False
+            rounds += 1
+        return result
+
+    @staticmethod
+    def __spread(matrix_t, vectors):
+        """
+            matrix_t · vectors, where vectors is a dense boolean (n x s) matrix
+        :return: a dense (n x s) matrix
+        """
+        if vectors.shape[1] == 1:
+            # sparse matrix-vector product
+            return (matrix_t @ vectors[:, 0].astype(float))[:, None]
+        # sparse matrix-matrix product
+        return (matrix_t @ sp.csc_matrix(vectors, dtype=float)).toarray()
+
+    def get_node_list(self):
+        return self.__node_list
@@ -0,0 +1,41 @@
+import networkx as nx
+
+from linear_threshold.LT_model import LinearThresholdModel
+
+
+def test_no_memoization_by_default():
+    lt_model = LinearThresholdModel(nx.path_graph(5))
+    lt_model.diffuse({0}, 1)
+    lt_model.link_the_fire([0, 4])
+    stats = lt_model.get_cache_stats()
+    assert stats["size"] == 0
+    assert stats["misses"] == 0
+
+
+def test_memoized_diffuse_follows_graph_changes():
+    graph = nx.path_graph(5)
+    lt_model = LinearThresholdModel(graph, cache_size=8)
+    assert lt_model.diffuse({0}, 1) == [[0], [1]]
+    assert lt_model.diffuse({0}, 1) == [[0], [1]]
+    assert lt_model.get_cache_stats()["hits"] == 1
+
+    # an edge between known nodes keeps the node count, so it must be marked
+    graph.add_edge(0, 4)
+    lt_model.mark_graph_changed()
+    assert [set(layer) for layer in lt_model.diffuse({0}, 1)] == [{0}, {1, 4}]
+
+    # a new node is noticed without it
+    graph.add_edge(0, 5)
+    assert [set(layer) for layer in lt_model.diffuse({0}, 1)] == [{0}, {1, 4, 5}]
+
+
+def test_memoized_link_the_fire_resumes_from_prefix():
+    graph = nx.path_graph(10)
+    reference = LinearThresholdModel(graph)
+    lt_model = LinearThresholdModel(graph, cache_size=8)
+    assert lt_model.link_the_fire([0, 5]) == reference.link_the_fire([0, 5])
+    assert lt_model.link_the_fire([0, 5, 9]) == reference.link_the_fire([0, 5, 9])
+    assert lt_model.get_cache_stats()["prefix_hits"] == 1
+
+    graph.add_edge(9, 10)
+    assert lt_model.link_the_fire([0, 5, 9]) == reference.link_the_fire([0, 5, 9])
@@ -0,0 +1,81 @@
+import networkx as nx
+
+from linear_threshold.components import (
+    connected_components,
+    parallel_diffuse,
+    parallel_find_mbs,
+    parallel_find_mds,
+)
+from linear_threshold.LT_model import LinearThresholdModel
+
+
+def same_layers(layers1, layers2):
+    return [set(layer) for layer in layers1] == [set(layer) for layer in layers2]
+
+
+def test_connected_components():
+    graph = nx.Graph([(0, 1), (1, 2), (3, 4)])
+    graph.add_node(5)
+    components = connected_components(graph)
+    assert sorted(map(sorted, components)) == [[0, 1, 2], [3, 4], [5]]
+    assert len(components[0]) == 3
+
+
+def test_parallel_find_mds():
+    graph = nx.disjoint_union_all(
+        [nx.path_graph(7), nx.star_graph(4), nx.cycle_graph(9)]
+    )
+    expected = LinearThresholdModel(graph).find_mds_basing_max_degree()
+    assert (
+        parallel_find_mds(graph, processes=2, min_component_size=1, min_parallel_work=0)
+        == expected
+    )
+
+
+def test_parallel_diffuse_undirected_disconnected():
+    graph = nx.union(nx.path_graph(3), nx.path_graph(range(10, 20)))
+    expected = LinearThresholdModel(graph).diffuse({0, 10}, 10)
+    for processes in (1, 2):
+        layers = parallel_diffuse(
+            graph,
+            {0, 10},
+            10,
+            processes=processes,
+            min_component_size=1,
+            min_parallel_work=0,
+        )
+        assert same_layers(layers, expected)
+
+
+def test_parallel_diffuse_directed_disconnected():
+    graph = nx.union(
+        nx.path_graph(3, create_using=nx.DiGraph),
+        nx.path_graph(range(10, 20), create_using=nx.DiGraph),
+    )
+    expected = LinearThresholdModel(graph).diffuse({0, 10}, 15)
+    layers = parallel_diffuse(
+        graph, {0, 10}, 15, processes=2, min_component_size=1, min_parallel_work=0
+    )
+    assert same_layers(layers, expected)
+
+
+def test_parallel_diffuse_directed_steps_0_stops():
+    # node 0 can never be activated, diffuse(steps=0) would loop forever
+    graph = nx.DiGraph([(0, 1), (2, 1), (5, 6)])
+    layers = parallel_diffuse(graph, {1, 5}, 0, processes=1, min_component_size=1)
+    assert same_layers(layers, [{1, 5}, {6}, set()])
+
+
+def test_parallel_find_mbs_burns_the_whole_graph():
+    graph = nx.disjoint_union_all(
+        [nx.path_graph(9), nx.star_graph(5), nx.cycle_graph(12), nx.empty_graph(2)]
+    )
+    lt_model = LinearThresholdModel(graph)
+    for processes, min_parallel_work in ((2, 0), (1, 0), (2, 10**6)):
+        sequence = parallel_find_mbs(
+            graph,
+            processes=processes,
+            min_component_size=1,
+            min_parallel_work=min_parallel_work,
+        )
+        assert lt_model.link_the_fire(sequence) == len(graph)
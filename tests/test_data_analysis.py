@@ -0,0 +1,21 @@
+from linear_threshold.data_analysis import draw_3d
+
+
+def test_draw_3d_colors_nodes_by_first_activating_layer(tmp_path):
+    edges = [(0, 1), (1, 2), (2, 3), (3, 4)]
+    # the layers of an undirected diffuse() repeat the active nodes
+    layer_i_nodes = [[0], [1], [0, 1, 2], [0, 1, 2, 3], [0, 1, 2, 3, 4]]
+    fig = draw_3d(
+        edges, layer_i_nodes=layer_i_nodes, filename=str(tmp_path / "graph.html")
+    )
+    assert list(fig.data[1].marker.color) == [0, 1, 2, 3, 4]
+    assert (tmp_path / "graph.html").exists()
+
+
+def test_draw_3d_leaves_inactive_nodes_uncolored(tmp_path):
+    edges = [(0, 1), (1, 2), (5, 6)]
+    fig = draw_3d(
+        edges, layer_i_nodes=[[1], [0, 2, 7]], filename=str(tmp_path / "g.html")
+    )
+    assert list(fig.data[1].marker.color) == [1, 0, 1, -1, -1]
+    assert len(fig.data[0].x) == 3 * len(edges)
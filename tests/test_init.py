@@ -0,0 +1,22 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_import_leaves_heavy_modules_unloaded():
+    code = (
+        "import sys\n"
+        "from linear_threshold import LinearThresholdModel\n"
+        "heavy = ['networkx', 'numpy', 'igraph', 'plotly']\n"
+        "print(','.join(m for m in heavy if m in sys.modules))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    assert output.strip() == ""
@@ -0,0 +1,49 @@
+import networkx as nx
+
+from linear_threshold.LT_model import LinearThresholdModel
+from linear_threshold.robustness import burning_robustness, seed_robustness
+
+
+def test_seed_robustness_without_failures():
+    graph = nx.path_graph(10)
+    report = seed_robustness(graph, {0, 9}, failure_prob=0, samples=3, steps=2)
+    assert report["coverage"] == [6, 6, 6]
+    assert report["nodes"] == [0, 9]
+    assert report["leave_one_out"] == [[3, 3, 3], [3, 3, 3]]
+    assert report["contribution"] == [3.0, 3.0]
+
+
+def test_seed_robustness_matches_diffuse():
+    graph = nx.gnp_random_graph(60, 0.05, directed=True, seed=1)
+    seeds = {0, 1, 2, 3}
+    report = seed_robustness(graph, seeds, failure_prob=0, samples=1, steps=4)
+    lt_model = LinearThresholdModel(graph)
+    expected = len(set().union(*lt_model.diffuse(seeds, 4)))
+    assert report["coverage"] == [expected]
+    for node, loo in zip(report["nodes"], report["leave_one_out"]):
+        expected = len(set().union(*lt_model.diffuse(seeds - {node}, 4)))
+        assert loo == [expected]
+
+
+def test_burning_robustness_reports_repeated_nodes_by_position():
+    graph = nx.path_graph(10)
+    burning_seq = [0, 9, 0]
+    report = burning_robustness(graph, burning_seq, failure_prob=0, samples=2)
+    lt_model = LinearThresholdModel(graph)
+    assert report["nodes"] == burning_seq
+    assert report["coverage"] == [lt_model.link_the_fire(burning_seq)] * 2
+    assert len(report["leave_one_out"]) == len(burning_seq)
+    for k in range(len(burning_seq)):
+        expected = lt_model.link_the_fire(burning_seq[:k] + burning_seq[k + 1 :])
+        assert report["leave_one_out"][k] == [expected] * 2
+
+
+def test_robustness_does_not_depend_on_processes():
+    graph = nx.gnp_random_graph(80, 0.05, seed=2)
+    reports = [
+        seed_robustness(
+            graph, {0, 1, 2}, failure_prob=0.3, samples=8, processes=p, random_seed=7
+        )
+        for p in (1, 2)
+    ]
+    assert reports[0] == reports[1]
@@ -0,0 +1,145 @@
+import asyncio
+import json
+
+from linear_threshold.server import LTServer
+
+EDGES = [[0, 1], [1, 2], [2, 3], [3, 4], [1, 5]]
+
+
+async def request(port, method, path, body=None):
+    data = json.dumps(body).encode() if body is not None else b""
+    return await raw_request(
+        port,
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+        f"Content-Length: {len(data)}\r\n\r\n".encode() + data,
+    )
+
+
+async def raw_request(port, data):
+    # a raw client which reads the response until EOF
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(data)
+    writer.write_eof()
+    await writer.drain()
+    response = await asyncio.wait_for(reader.read(), timeout=30)
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+async def run_session():
+    server = LTServer(port=0, processes=2)
+    await server.start()
+    port = server.port
+    try:
+        status, payload = await request(port, "PUT", "/models/g", {"edges": EDGES})
+        assert status == 200 and payload["name"] == "g"
+
+        status, payload = await request(
+            port, "POST", "/models/g/diffuse", {"seeds": [0], "steps": 1}
+        )
+        assert status == 200
+        assert [set(layer) for layer in payload["result"]] == [{0}, {1}]
+
+        status, payload = await request(
+            port, "POST", "/models/g/spread", {"burning_seq": [1, 4]}
+        )
+        assert status == 200 and payload["result"] == 6
+
+        status, _ = await request(
+            port, "PUT", "/models/big", {"edges": [[i, i + 1] for i in range(20000)]}
+        )
+        assert status == 200
+        results = await asyncio.gather(
+            *[request(port, "POST", "/models/big/mds") for _ in range(4)]
+        )
+        assert all(status == 200 for status, _ in results)
+        assert len({json.dumps(payload) for _, payload in results}) == 1
+        assert server.coalesced >= 1
+
+        status, payload = await request(port, "POST", "/models/g/mbs")
+        assert status == 200 and payload["result"][0] == 1
+
+        bad_bodies = [
+            {"seeds": [0], "steps": "x"},
+            {"seeds": [[0]]},
+            {"seeds": 0},
+        ]
+        for body in bad_bodies:
+            status, payload = await request(port, "POST", "/models/g/diffuse", body)
+            assert status == 400, payload
+        bad_requests = [
+            b"POST /models/g/mds HTTP/1.1\r\nContent-Length: x\r\n\r\n",
+            b"POST /models/g/mds HTTP/1.1\r\nContent-Length: 10\r\n\r\n{}",
+        ]
+        for data in bad_requests:
+            status, payload = await raw_request(port, data)
+            assert status == 400, payload
+        status, payload = await request(
+            port, "POST", "/models/g/diffuse", {"seeds": [99999999]}
+        )
+        assert status == 404 and "99999999" in payload["error"]
+        status, payload = await request(
+            port, "POST", "/models/g/spread", {"burning_seq": ["a"]}
+        )
+        assert status == 404
+
+        status, payload = await request(port, "GET", "/models")
+        assert status == 200 and "g" in payload["models"]
+        status, _ = await request(port, "DELETE", "/models/g")
+        assert status == 200
+        status, _ = await request(port, "POST", "/models/g/mds")
+        assert status == 404
+    finally:
+        await server.close()
+
+
+def test_server_on_localhost():
+    asyncio.run(run_session())
+
+
+async def run_disconnected_session():
+    # a single worker, so a stuck diffusion would block every later query
+    server = LTServer(port=0, processes=1)
+    await server.start()
+    port = server.port
+    try:
+        for directed in (False, True):
+            body = {"edges": [[0, 1], [2, 3]], "directed": directed}
+            status, _ = await request(port, "PUT", "/models/g", body)
+            assert status == 200
+            status, payload = await request(
+                port, "POST", "/models/g/diffuse", {"seeds": [0]}
+            )
+            assert status == 200
+            assert set().union(*payload["result"]) == {0, 1}
+            status, _ = await request(port, "POST", "/models/g/mbs")
+            assert status == 200
+    finally:
+        await server.close()
+
+
+def test_server_diffuse_default_steps_on_disconnected_graph():
+    asyncio.run(run_disconnected_session())
+
+
+async def run_eviction_session():
+    server = LTServer(port=0, processes=1, max_bytes=1)
+    await server.start()
+    port = server.port
+    try:
+        for name in ("a", "b"):
+            status, _ = await request(port, "PUT", f"/models/{name}", {"edges": EDGES})
+            assert status == 200
+        status, payload = await request(port, "GET", "/models")
+        assert status == 200
+        assert payload["evictions"] == 1
+        assert list(payload["models"]) == ["b"]
+        status, _ = await request(port, "POST", "/models/a/mds")
+        assert status == 404
+    finally:
+        await server.close()
+
+
+def test_server_evicts_by_memory():
+    asyncio.run(run_eviction_session())
@@ -0,0 +1,94 @@
+import networkx as nx
+
+from linear_threshold.LT_model import LinearThresholdModel
+from linear_threshold.sparse_model import SparseLinearThresholdModel
+
+
+def as_sets(layer_i_nodes):
+    return [set(layer) for layer in layer_i_nodes]
+
+
+def directed_graph():
+    # node 5 has a threshold no in-edges can reach, so it is never activated
+    graph = nx.DiGraph()
+    graph.add_edges_from([(0, 1), (1, 2), (2, 3), (3, 1), (0, 4), (4, 2), (2, 5)])
+    graph.add_edge(6, 5, influence=0.2)
+    graph.nodes[5]["threshold"] = 1.0
+    graph.nodes[2]["threshold"] = 0.9
+    return graph
+
+
+def classic_lt_diffuse(graph, seeds, steps=0):
+    """
+    the classic LT rule: a node is activated if the influence sum of
+    its active predecessors >= its threshold
+    """
+    lt_graph = LinearThresholdModel(graph).get_graph()
+    active = set(seeds)
+    layer_i_nodes = [set(seeds)]
+    rounds = 0
+    while len(active) < len(lt_graph) and (steps <= 0 or rounds < steps):
+        new = set()
+        for node in set(lt_graph) - active:
+            influence_in = sum(
+                influence
+                for u, _, influence in lt_graph.in_edges(node, data="influence")
+                if u in active
+            )
+            if influence_in >= lt_graph.nodes[node]["threshold"]:
+                new.add(node)
+        layer_i_nodes.append(new)
+        active |= new
+        rounds += 1
+        if not new:
+            break
+    return layer_i_nodes
+
+
+def test_undirected_matches_reference():
+    graph = nx.Graph([(0, 1), (1, 2), (2, 3), (3, 4), (1, 5), (5, 6)])
+    lt_model = LinearThresholdModel(graph)
+    sparse_model = SparseLinearThresholdModel(graph)
+    seed_sets = [{0}, {3}, {0, 6}, {2, 4}]
+    # steps=0 ends in the reference model, since the graph is connected
+    for steps in (0, 1, 2, 5):
+        expected = [as_sets(lt_model.diffuse(seeds, steps)) for seeds in seed_sets]
+        for seeds, layers in zip(seed_sets, expected):
+            assert as_sets(sparse_model.diffuse(seeds, steps)) == layers
+        results = sparse_model.diffuse_many(seed_sets, steps)
+        assert [as_sets(result) for result in results] == expected
+
+
+def test_directed_matches_reference():
+    graph = directed_graph()
+    lt_model = LinearThresholdModel(graph)
+    sparse_model = SparseLinearThresholdModel(graph)
+    seed_sets = [{0}, {1}, {0, 3}, {6}]
+    # steps > 0 only, node 5 makes steps=0 loop forever in the reference model
+    for steps in (1, 2, 3, 10):
+        expected = [as_sets(lt_model.diffuse(seeds, steps)) for seeds in seed_sets]
+        for seeds, layers in zip(seed_sets, expected):
+            assert as_sets(sparse_model.diffuse(seeds, steps)) == layers
+        results = sparse_model.diffuse_many(seed_sets, steps)
+        assert [as_sets(result) for result in results] == expected
+
+
+def test_directed_steps_zero_stops():
+    graph = directed_graph()
+    sparse_model = SparseLinearThresholdModel(graph)
+    expected = as_sets(LinearThresholdModel(graph).diffuse({0}, len(graph)))
+    assert as_sets(sparse_model.diffuse({0})) == expected
+
+
+def test_influence_rule_matches_classic_lt():
+    graph = directed_graph()
+    random_graph = nx.gnp_random_graph(30, 0.15, directed=True, seed=3)
+    for graph_, seed_sets in [
+        (graph, [{0}, {1}, {0, 3}, {6}]),
+        (random_graph, [{0}, {1, 2}, {5, 10, 15}]),
+    ]:
+        sparse_model = SparseLinearThresholdModel(graph_, rule="influence")
+        for steps in (0, 1, 2):
+            expected = [classic_lt_diffuse(graph_, seeds, steps) for seeds in seed_sets]
+            results = sparse_model.diffuse_many(seed_sets, steps)
+            assert [as_sets(result) for result in results] == expected